@@ -1,34 +1,32 @@
-from collections import defaultdict
 from typing import Any, Dict, Iterable
 
+from utils.data_cleaner import Listing
+
 class DealerExtractor:
     """
     Helper for aggregating scraped listings by dealer.
     """
 
     @staticmethod
-    def build_summary(listings: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    def build_summary(listings: Iterable[Listing]) -> Dict[str, Dict[str, Any]]:
         """
         Build a simple aggregation keyed by dealerName.
         """
         summary: Dict[str, Dict[str, Any]] = {}
-        counter = defaultdict(int)
 
         for rec in listings:
-            dealer_name = (rec.get("dealerName") or "").strip()
+            dealer_name = (rec.dealerName or "").strip()
             if not dealer_name:
                 dealer_name = "Unknown dealer"
 
-            counter[dealer_name] += 1
-            dealer_entry = summary.setdefault(
-                dealer_name,
-                {
+            dealer_entry = summary.get(dealer_name)
+            if dealer_entry is None:
+                dealer_entry = summary[dealer_name] = {
                     "dealerName": dealer_name,
-                    "location": rec.get("location"),
-                    "dealerRatings": rec.get("dealerRatings"),
+                    "location": rec.location,
+                    "dealerRatings": rec.dealerRatings,
                     "listingCount": 0,
-                },
-            )
-            dealer_entry["listingCount"] = counter[dealer_name]
+                }
+            dealer_entry["listingCount"] += 1
 
         return summary
\ No newline at end of file
@@ -1,19 +1,48 @@
+import asyncio
+import contextlib
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Iterable, List, Optional, Set, Tuple
-from urllib.parse import urlparse
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
-import requests
+import aiohttp
 
-from utils.data_cleaner import normalize_listing
-from utils.parser import ListingParser
+try:
+    from aiohttp_client_cache import CachedSession, SQLiteBackend
+except ImportError:  # pragma: no cover - optional dependency
+    CachedSession = None
+
+from utils.data_cleaner import Listing, normalize_listing
+from utils.parser import (
+    PARALLEL_PARSE_MIN_PAGES,
+    ListingParser,
+    create_parse_pool,
+    parse_one,
+)
 from utils.proxy_manager import ProxyManager
 
 log = logging.getLogger(__name__)
 
+# Autoscout24 search results are paginated 20 per page via ?page=k.
+SEARCH_PAGE_SIZE = 20
+
+# Cached responses without Cache-Control/Expires headers are reused for an hour.
+DEFAULT_CACHE_EXPIRE_SECONDS = 3600
+
+# Transient failures are retried with exponential backoff (0.3s, 0.6s, 1.2s).
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+DNS_CACHE_TTL_SECONDS = 300
+
 class ListingExtractor:
     """
     Orchestrates HTTP fetching and HTML parsing for Autoscout24 listings.
+
+    All requests run on a single asyncio event loop sharing one
+    ``aiohttp.ClientSession``; at most ``parallel_requests`` are in flight.
     """
 
     def __init__(
@@ -23,11 +52,15 @@ class ListingExtractor:
         timeout: float = 15.0,
         parallel_requests: int = 8,
         user_agent: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        revalidate_cache: bool = False,
+        parse_workers: Optional[int] = None,
     ) -> None:
         self.max_records = max_records
         self.proxy_manager = proxy_manager or ProxyManager()
         self.timeout = timeout
         self.parallel_requests = max(1, parallel_requests)
+        self.parse_workers = parse_workers
         self.user_agent = user_agent or (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -35,117 +68,269 @@ class ListingExtractor:
         )
 
         self.parser = ListingParser()
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": self.user_agent})
         self.log = logging.getLogger(self.__class__.__name__)
 
+        self.cache_path = cache_path
+        self.revalidate_cache = revalidate_cache
+        if cache_path and CachedSession is None:
+            self.log.warning(
+                "HTTP cache %s requested but aiohttp-client-cache is not "
+                "installed; fetching without a cache.",
+                cache_path,
+            )
+            self.cache_path = None
+
+        # Bound to the running event loop for the duration of scrape().
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Started by scrape() once enough listing URLs have been found.
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        headers = {"User-Agent": self.user_agent}
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        # Keep-alive pool sized to the concurrency cap, with resolved
+        # hostnames reused across requests.
+        connector = aiohttp.TCPConnector(
+            limit=self.parallel_requests * 2,
+            ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+        )
+        if self.cache_path:
+            # On-disk cache keyed by URL; Cache-Control headers from the
+            # server take precedence over the default expiry. A no-cache
+            # request header skips stored entries but still saves the fresh
+            # responses, so the next cached run sees current data.
+            if self.revalidate_cache:
+                headers["Cache-Control"] = "no-cache"
+            cache = SQLiteBackend(
+                cache_name=self.cache_path,
+                expire_after=DEFAULT_CACHE_EXPIRE_SECONDS,
+                cache_control=True,
+            )
+            return CachedSession(
+                cache=cache, headers=headers, timeout=timeout, connector=connector
+            )
+        return aiohttp.ClientSession(
+            headers=headers, timeout=timeout, connector=connector
+        )
+
     def _is_detail_url(self, url: str) -> bool:
-        path = urlparse(url).path.lower()
-        return "/angebote/" in path or "/offers/" in path
+        url = url.lower()
+        return "/angebote/" in url or "/offers/" in url
+
+    async def _fetch_url(self, url: str) -> Optional[bytes]:
+        """
+        Return the raw response body; decoding is left to the HTML parser.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+            proxies = self.proxy_manager.get_next()
+            proxy = proxies["http"] if proxies else None
+            try:
+                async with self._semaphore:
+                    async with self._session.get(url, proxy=proxy) as resp:
+                        if resp.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                            self.log.debug("Retrying %s after HTTP %d", url, resp.status)
+                            continue
+                        resp.raise_for_status()
+                        return await resp.read()
+            except aiohttp.ClientResponseError as exc:
+                self.log.warning("Failed to fetch %s: %s", url, exc)
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if proxy and isinstance(exc, aiohttp.ClientProxyConnectionError):
+                    self.proxy_manager.mark_dead(proxy)
+                if attempt == MAX_RETRIES:
+                    self.log.warning("Failed to fetch %s: %s", url, exc)
+                    return None
+                self.log.debug("Retrying %s after error: %s", url, exc)
+        return None
 
-    def _fetch_url(self, url: str) -> Optional[str]:
-        proxies = self.proxy_manager.get_next()
+    def _generate_page_urls(self, start_url: str, n_pages: int) -> Iterator[str]:
+        """
+        Predict the search result page URLs following ``start_url``.
+        """
+        parts = urlparse(start_url)
+        query = parse_qs(parts.query, keep_blank_values=True)
         try:
-            resp = self.session.get(
-                url,
-                timeout=self.timeout,
-                proxies=proxies,
-            )
-            resp.raise_for_status()
-            return resp.text
-        except requests.RequestException as exc:
-            self.log.warning("Failed to fetch %s: %s", url, exc)
+            first_page = int(query.get("page", ["1"])[0])
+        except ValueError:
+            first_page = 1
+
+        yield start_url
+        for page in range(first_page + 1, first_page + n_pages):
+            query["page"] = [str(page)]
+            yield urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+    async def _fetch_search_page(
+        self, url: str
+    ) -> Optional[Tuple[List[str], Optional[str]]]:
+        """
+        Return (listing URLs, next page URL), or None if the fetch failed.
+        """
+        html = await self._fetch_url(url)
+        if not html:
             return None
+        return self.parser.parse_search_page(html, url)
+
+    async def _collect_listing_urls_from_search(
+        self, start_url: str, budget: int
+    ) -> AsyncIterator[str]:
+        """
+        Yield up to ``budget`` detail URLs from a search, in page order.
 
-    def _collect_listing_urls_from_search(
-        self, start_url: str
-    ) -> List[str]:
-        listing_urls: List[str] = []
+        The pages needed to reach ``budget`` are requested concurrently up
+        front but read back in page order, so the first listings are kept and
+        only the tail is cancelled once the budget is met. If they fall short,
+        pagination continues sequentially from the last "next" link found;
+        pages whose fetch failed are requested again on that path.
+        """
+        seen: Set[str] = set()
+        n_pages = max(1, math.ceil(budget / SEARCH_PAGE_SIZE))
+        page_urls = list(self._generate_page_urls(start_url, n_pages))
         visited_pages: Set[str] = set()
-        next_url: Optional[str] = start_url
+        next_url: Optional[str] = None
+
+        tasks = [
+            asyncio.create_task(self._fetch_search_page(url)) for url in page_urls
+        ]
+        try:
+            for url, task in zip(page_urls, tasks):
+                page = await task
+                if page is None:
+                    continue
+                visited_pages.add(url)
+                found, page_next = page
+                if page_next:
+                    next_url = page_next
+                for u in found:
+                    if u not in seen:
+                        seen.add(u)
+                        yield u
+                if len(seen) >= budget:
+                    return
+        finally:
+            for task in tasks:
+                task.cancel()
 
-        while next_url and len(listing_urls) < self.max_records:
+        while next_url and len(seen) < budget:
             if next_url in visited_pages:
                 break
             visited_pages.add(next_url)
 
-            html = self._fetch_url(next_url)
-            if not html:
+            page = await self._fetch_search_page(next_url)
+            if page is None:
                 break
-
-            page_urls, next_url = self.parser.parse_search_page(html, next_url)
-            for u in page_urls:
-                if u not in listing_urls:
-                    listing_urls.append(u)
-            if not next_url:
+            found, next_url = page
+            if not found:
                 break
+            for u in found:
+                if u not in seen:
+                    seen.add(u)
+                    yield u
 
-        return listing_urls
-
-    def _prepare_listing_urls(self, start_urls: Iterable[str]) -> List[str]:
-        listing_urls: List[str] = []
+    async def _prepare_listing_urls(
+        self, start_urls: Iterable[str]
+    ) -> AsyncIterator[str]:
+        """
+        Yield unique detail URLs (at most ``max_records``) from the start URLs.
+        """
+        seen: Set[str] = set()
         for start_url in start_urls:
+            if len(seen) >= self.max_records:
+                break
+
             start_url = start_url.strip()
             if not start_url:
                 continue
 
             if self._is_detail_url(start_url):
-                if start_url not in listing_urls:
-                    listing_urls.append(start_url)
+                if start_url not in seen:
+                    seen.add(start_url)
+                    yield start_url
                 continue
 
             self.log.info("Expanding search URL: %s", start_url)
-            urls = self._collect_listing_urls_from_search(start_url)
-            for u in urls:
-                if u not in listing_urls:
-                    listing_urls.append(u)
-
-            if len(listing_urls) >= self.max_records:
-                break
-
-        if len(listing_urls) > self.max_records:
-            listing_urls = listing_urls[: self.max_records]
+            budget = self.max_records - len(seen)
+            # aclosing() runs the generator's cleanup on break, cancelling
+            # the unread search-page fetches before detail fetches queue up.
+            async with contextlib.aclosing(
+                self._collect_listing_urls_from_search(start_url, budget)
+            ) as found:
+                async for u in found:
+                    if len(seen) >= self.max_records:
+                        break
+                    if u not in seen:
+                        seen.add(u)
+                        yield u
 
         self.log.info(
             "Prepared %d listing URLs (max=%d).",
-            len(listing_urls),
+            len(seen),
             self.max_records,
         )
-        return listing_urls
 
-    def _scrape_single_listing(self, url: str) -> Optional[Dict]:
-        html = self._fetch_url(url)
+    async def _fetch_and_parse(self, url: str) -> Optional[Listing]:
+        html = await self._fetch_url(url)
         if not html:
             return None
-        raw_record = self.parser.parse_listing_page(html, url)
-        return normalize_listing(raw_record)
+        pool = self._parse_pool
+        if pool is None:
+            return self.parser._parse_listing_safe(html, url)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, parse_one, (html, url))
 
-    def scrape(self, start_urls: Iterable[str]) -> List[Dict]:
+    async def scrape(self, start_urls: Iterable[str]) -> List[Listing]:
         """
-        High-level function to scrape all listings from a set of start URLs.
+        High-level coroutine to scrape all listings from a set of start URLs.
+
+        Detail pages are scheduled as soon as their URLs are discovered, so
+        listing downloads overlap with search-page pagination. Each page is
+        parsed as soon as it arrives, so its body is released once parsed
+        instead of held for the batch. Small runs parse in-process; the
+        ``parse_workers`` process pool is only started once
+        PARALLEL_PARSE_MIN_PAGES listing URLs have been found, and takes
+        every page fetched from then on.
         """
-        urls = self._prepare_listing_urls(start_urls)
+        self._semaphore = asyncio.Semaphore(self.parallel_requests)
+        urls: List[str] = []
+        tasks: List[asyncio.Task] = []
+        try:
+            async with self._create_session() as session:
+                self._session = session
+                async for url in self._prepare_listing_urls(start_urls):
+                    urls.append(url)
+                    if len(urls) == PARALLEL_PARSE_MIN_PAGES:
+                        self._parse_pool = create_parse_pool(
+                            self.parse_workers, len(urls)
+                        )
+                    tasks.append(asyncio.create_task(self._fetch_and_parse(url)))
+                outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._session = None
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+
         if not urls:
             self.log.warning("No listing URLs to scrape.")
             return []
 
-        results: List[Dict] = []
-        with ThreadPoolExecutor(max_workers=self.parallel_requests) as executor:
-            future_to_url: Dict = {
-                executor.submit(self._scrape_single_listing, url): url
-                for url in urls
-            }
-
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    record = future.result()
-                except Exception as exc:  # noqa: BLE001
-                    self.log.error("Error scraping %s: %s", url, exc)
-                    continue
-
-                if record:
-                    results.append(record)
+        results: List[Listing] = []
+        for url, outcome in zip(urls, outcomes):
+            if isinstance(outcome, BaseException):
+                self.log.error("Error scraping %s: %s", url, outcome)
+                continue
+            if outcome is not None:
+                results.append(normalize_listing(outcome))
 
         self.log.info("Successfully scraped %d listings.", len(results))
-        return results
\ No newline at end of file
+        return results
+
+    def scrape_sync(self, start_urls: Iterable[str]) -> List[Listing]:
+        """
+        Blocking wrapper around :meth:`scrape` for synchronous callers.
+        """
+        return asyncio.run(self.scrape(start_urls))
@@ -1,18 +1,56 @@
 import argparse
+import csv
 import json
 import logging
 import sys
+from dataclasses import fields
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
+
+from lxml import etree
 
 from extractors.listing_extractor import ListingExtractor
 from extractors.dealer_extractor import DealerExtractor
 from utils.proxy_manager import ProxyManager
-from utils.data_cleaner import ensure_directory
+from utils.data_cleaner import Listing, ensure_directory
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 DEFAULT_MAX_RECORDS = 300
 DEFAULT_OUTPUT_FORMAT = "json"
 
+# Every Listing has the same fields, so tabular columns come from the schema
+# rather than a scan over the records.
+LISTING_COLUMNS = sorted(f.name for f in fields(Listing))
+
+HTML_HEAD = """<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Autoscout24 Scraper Output</title>
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <style>
+    body { font-family: Arial, sans-serif; margin: 1.5rem; }
+    table { border-collapse: collapse; width: 100%; }
+    th, td { border: 1px solid #ddd; padding: 0.5rem; font-size: 0.9rem; }
+    th { background: #f5f5f5; text-align: left; }
+    tr:nth-child(even) { background: #fafafa; }
+  </style>
+</head>
+<body>
+  <h1>Autoscout24 Scraper Output</h1>
+  <table>
+"""
+HTML_TAIL = """
+    </tbody>
+  </table>
+</body>
+</html>
+"""
+
 def setup_logging(verbosity: int) -> None:
     level = logging.WARNING
     if verbosity == 1:
@@ -28,6 +66,8 @@ def setup_logging(verbosity: int) -> None:
 def load_json_file(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"Config file does not exist: {path}")
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -48,7 +88,18 @@ def merge_settings(
     override: Dict[str, Any],
 ) -> Dict[str, Any]:
     merged = dict(base or {})
-    for key, value in (override or {}).items():
+    if not override:
+        return merged
+
+    # Fast path: nothing to merge recursively, so a single update suffices.
+    if not any(
+        isinstance(value, dict) and isinstance(merged.get(key), dict)
+        for key, value in override.items()
+    ):
+        merged.update((k, v) for k, v in override.items() if v is not None)
+        return merged
+
+    for key, value in override.items():
         if isinstance(value, dict) and isinstance(merged.get(key), dict):
             merged[key] = merge_settings(merged[key], value)
         elif value is not None:
@@ -81,104 +132,104 @@ def read_start_urls(input_cfg: Dict[str, Any], data_dir: Path) -> List[str]:
 
     return urls
 
-def export_data(records: List[Dict[str, Any]], output_path: Path, fmt: str) -> None:
-    fmt = (fmt or DEFAULT_OUTPUT_FORMAT).lower()
-    ensure_directory(output_path.parent)
-
-    if fmt == "json":
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(records, f, ensure_ascii=False, indent=2)
-        return
-
-    if fmt == "csv":
-        import csv
-
-        fieldnames = sorted({k for r in records for k in r.keys()})
-        with output_path.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for r in records:
-                writer.writerow({k: r.get(k, "") for k in fieldnames})
-        return
-
-    if fmt == "xml":
-        from xml.etree.ElementTree import Element, SubElement, ElementTree
-
-        root = Element("listings")
+# Records are written one at a time but laid out as json.dump(records,
+# indent=2) would: each indented object is shifted one level into the array.
+# JSON strings never contain a raw newline, so the shift is safe.
+def _export_json_orjson(records: List[Listing], output_path: Path) -> None:
+    with output_path.open("wb") as f:
+        if not records:
+            f.write(b"[]")
+            return
+        f.write(b"[")
+        for i, rec in enumerate(records):
+            f.write(b",\n  " if i else b"\n  ")
+            text = orjson.dumps(rec, option=orjson.OPT_INDENT_2)
+            f.write(text.replace(b"\n", b"\n  "))
+        f.write(b"\n]")
+
+def _export_json_stdlib(records: List[Listing], output_path: Path) -> None:
+    with output_path.open("w", encoding="utf-8") as f:
+        if not records:
+            f.write("[]")
+            return
+        f.write("[")
+        for i, rec in enumerate(records):
+            f.write(",\n  " if i else "\n  ")
+            text = json.dumps(rec.to_dict(), ensure_ascii=False, indent=2)
+            f.write(text.replace("\n", "\n  "))
+        f.write("\n]")
+
+def _export_csv(records: List[Listing], output_path: Path) -> None:
+    with output_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=LISTING_COLUMNS)
+        writer.writeheader()
         for rec in records:
-            item_el = SubElement(root, "listing")
-            for k, v in rec.items():
-                field_el = SubElement(item_el, k)
-                field_el.text = "" if v is None else str(v)
-        tree = ElementTree(root)
-        tree.write(output_path, encoding="utf-8", xml_declaration=True)
-        return
-
-    if fmt == "rss":
-        from xml.etree.ElementTree import Element, SubElement, ElementTree
-
-        rss = Element("rss", version="2.0")
-        channel = SubElement(rss, "channel")
-        title = SubElement(channel, "title")
-        title.text = "Autoscout24 Scraper Feed"
-        link = SubElement(channel, "link")
-        link.text = "https://www.autoscout24.com"
-        description = SubElement(channel, "description")
-        description.text = "Scraped Autoscout24 car listings"
-
-        for rec in records:
-            item = SubElement(channel, "item")
-            it_title = SubElement(item, "title")
-            it_title.text = str(rec.get("title") or "Car listing")
-            it_link = SubElement(item, "link")
-            it_link.text = str(rec.get("url") or "")
-            it_desc = SubElement(item, "description")
-            it_desc.text = str(rec.get("dealerName") or "")
-
-        tree = ElementTree(rss)
-        tree.write(output_path, encoding="utf-8", xml_declaration=True)
-        return
-
-    if fmt == "html":
-        headers = sorted({k for r in records for k in r.keys()})
-        rows = []
+            writer.writerow(rec.to_dict())
+
+# XML and RSS are streamed with lxml's incremental writer, so no element
+# tree is held in memory.
+def _export_xml(records: List[Listing], output_path: Path) -> None:
+    with etree.xmlfile(str(output_path), encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element("listings"):
+            for rec in records:
+                with xf.element("listing"):
+                    for k, v in rec.to_dict().items():
+                        with xf.element(k):
+                            xf.write("" if v is None else str(v))
+
+def _export_rss(records: List[Listing], output_path: Path) -> None:
+    with etree.xmlfile(str(output_path), encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element("rss", version="2.0"), xf.element("channel"):
+            with xf.element("title"):
+                xf.write("Autoscout24 Scraper Feed")
+            with xf.element("link"):
+                xf.write("https://www.autoscout24.com")
+            with xf.element("description"):
+                xf.write("Scraped Autoscout24 car listings")
+
+            for rec in records:
+                with xf.element("item"):
+                    with xf.element("title"):
+                        xf.write(str(rec.title or "Car listing"))
+                    with xf.element("link"):
+                        xf.write(str(rec.url or ""))
+                    with xf.element("description"):
+                        xf.write(str(rec.dealerName or ""))
+
+def _export_html(records: List[Listing], output_path: Path) -> None:
+    head_cells = "".join(f"<th>{h}</th>" for h in LISTING_COLUMNS)
+    with output_path.open("w", encoding="utf-8") as f:
+        f.write(HTML_HEAD)
+        f.write(f"    <thead><tr>{head_cells}</tr></thead>\n    <tbody>\n      ")
         for rec in records:
+            row = rec.to_dict()
             row_cells = "".join(
-                f"<td>{(rec.get(h) if rec.get(h) is not None else '')}</td>"
-                for h in headers
+                f"<td>{(row[h] if row[h] is not None else '')}</td>"
+                for h in LISTING_COLUMNS
             )
-            rows.append(f"<tr>{row_cells}</tr>")
-        head_cells = "".join(f"<th>{h}</th>" for h in headers)
-        html = f"""<!doctype html>
-<html lang="en">
-<head>
-  <meta charset="utf-8">
-  <title>Autoscout24 Scraper Output</title>
-  <meta name="viewport" content="width=device-width, initial-scale=1">
-  <style>
-    body {{ font-family: Arial, sans-serif; margin: 1.5rem; }}
-    table {{ border-collapse: collapse; width: 100%; }}
-    th, td {{ border: 1px solid #ddd; padding: 0.5rem; font-size: 0.9rem; }}
-    th {{ background: #f5f5f5; text-align: left; }}
-    tr:nth-child(even) {{ background: #fafafa; }}
-  </style>
-</head>
-<body>
-  <h1>Autoscout24 Scraper Output</h1>
-  <table>
-    <thead><tr>{head_cells}</tr></thead>
-    <tbody>
-      {"".join(rows)}
-    </tbody>
-  </table>
-</body>
-</html>
-"""
-        with output_path.open("w", encoding="utf-8") as f:
-            f.write(html)
-        return
+            f.write(f"<tr>{row_cells}</tr>")
+        f.write(HTML_TAIL)
+
+# Records are written one at a time so no second copy of the whole dataset
+# is built in memory.
+_EXPORTERS: Dict[str, Callable[[List[Listing], Path], None]] = {
+    "json": _export_json_orjson if orjson is not None else _export_json_stdlib,
+    "csv": _export_csv,
+    "xml": _export_xml,
+    "rss": _export_rss,
+    "html": _export_html,
+}
+
+def export_data(records: List[Listing], output_path: Path, fmt: str) -> None:
+    fmt = (fmt or DEFAULT_OUTPUT_FORMAT).lower()
+    exporter = _EXPORTERS.get(fmt)
+    if exporter is None:
+        raise ValueError(f"Unsupported output format: {fmt}")
 
-    raise ValueError(f"Unsupported output format: {fmt}")
+    ensure_directory(output_path.parent)
+    exporter(records, output_path)
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -212,9 +263,15 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
         "--format",
         "-f",
         type=str,
-        choices=["json", "csv", "xml", "rss", "html"],
+        choices=list(_EXPORTERS),
         help="Output format (overrides config).",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Revalidate every page instead of serving it from the HTTP cache "
+        "(httpCacheFile); fresh responses still update the cache.",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -282,6 +339,8 @@ def main(argv: List[str] | None = None) -> None:
     parallel_requests = int(settings.get("parallelRequests") or 8)
     timeout = float(settings.get("timeoutSeconds") or 15.0)
     user_agent = settings.get("userAgent") or settings.get("user_agent")
+    cache_path = settings.get("httpCacheFile")
+    parse_workers = settings.get("parseWorkers")
 
     extractor = ListingExtractor(
         max_records=max_records,
@@ -289,6 +348,9 @@ def main(argv: List[str] | None = None) -> None:
         timeout=timeout,
         parallel_requests=parallel_requests,
         user_agent=user_agent,
+        cache_path=cache_path,
+        revalidate_cache=args.no_cache,
+        parse_workers=int(parse_workers) if parse_workers else None,
     )
 
     log.info(
@@ -298,7 +360,7 @@ def main(argv: List[str] | None = None) -> None:
         output_format,
     )
 
-    records = extractor.scrape(start_urls)
+    records = extractor.scrape_sync(start_urls)
     log.info("Scraping finished. Collected %d listings.", len(records))
 
     export_path = Path(output_file)
@@ -307,9 +369,11 @@ def main(argv: List[str] | None = None) -> None:
     except Exception as exc:  # noqa: BLE001
         raise SystemExit(f"Failed to export data: {exc}") from exc
 
-    # Optional dealer summary (not exported, but logged when verbose)
-    dealer_summary = DealerExtractor.build_summary(records)
-    log.debug("Dealer summary for %d dealers built.", len(dealer_summary))
+    # Optional dealer summary (not exported, only logged with -vv), so skip
+    # the extra pass over every record unless debug logging is on.
+    if log.isEnabledFor(logging.DEBUG):
+        dealer_summary = DealerExtractor.build_summary(records)
+        log.debug("Dealer summary for %d dealers built.", len(dealer_summary))
 
     print(f"Scraped {len(records)} listings into {export_path} ({output_format}).")
 
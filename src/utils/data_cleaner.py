@@ -1,10 +1,72 @@
 import logging
 import re
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 log = logging.getLogger(__name__)
 
+_DIGITS_RE = re.compile(r"\d+")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+_KW_RE = re.compile(r"(\d+)\s*kW")
+_HP_RE = re.compile(r"(\d+)\s*hp", re.IGNORECASE)
+_FEATURE_SPLIT_RE = re.compile(r"[;,]")
+
+# Feature list fields normalized by normalize_listing.
+FEATURE_FIELDS: Tuple[str, ...] = ("comfort", "media", "safety", "extras")
+
+@dataclass(slots=True)
+class Listing:
+    """
+    Normalized Autoscout24 listing.
+
+    Attribute names match the exported field names (see README).
+    """
+
+    title: Optional[str] = None
+    url: Optional[str] = None
+    mark: Optional[str] = None
+    model: Optional[str] = None
+    modelVersion: Optional[str] = None
+    location: Optional[str] = None
+    dealerName: Optional[str] = None
+    dealerRatings: Optional[str] = None
+    price: Optional[str] = None
+    rawPrice: Optional[int] = None
+    currency: Optional[str] = None
+    milage: Optional[str] = None
+    mileageKm: Optional[int] = None
+    gearbox: Optional[str] = None
+    firstRegistration: Optional[str] = None
+    fuelType: Optional[str] = None
+    power: Optional[str] = None
+    powerKW: Optional[int] = None
+    powerHP: Optional[int] = None
+    seller: Optional[str] = None
+    contactName: Optional[str] = None
+    contactPhone: Optional[str] = None
+    bodyType: Optional[str] = None
+    drivetrain: Optional[str] = None
+    seats: Optional[str] = None
+    seatsNum: Optional[int] = None
+    engineSize: Optional[str] = None
+    engineSizeCC: Optional[int] = None
+    gears: Optional[str] = None
+    gearsNum: Optional[int] = None
+    emissionClass: Optional[str] = None
+    comfort: List[str] = field(default_factory=list)
+    media: List[str] = field(default_factory=list)
+    safety: List[str] = field(default_factory=list)
+    extras: List[str] = field(default_factory=list)
+    colour: Optional[str] = None
+    manufacturerColour: Optional[str] = None
+    productionDate: Optional[str] = None
+    images: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field -> value mapping, for writers that need a dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 def ensure_directory(path: Path) -> None:
     """Create parent directory if needed."""
     try:
@@ -15,14 +77,25 @@ def ensure_directory(path: Path) -> None:
 def clean_text(value: Optional[str]) -> Optional[str]:
     if value is None:
         return None
-    text = str(value).strip()
-    text = re.sub(r"\s+", " ", text)
+    # str.split() collapses runs of (Unicode) whitespace in C, which is
+    # cheaper than a regex substitution on the short strings seen here.
+    text = " ".join(str(value).split())
     return text or None
 
+def clean_text_many(values: Iterable[Optional[str]]) -> List[str]:
+    """
+    Batch form of clean_text; values that clean to nothing are dropped.
+    """
+    return [
+        text
+        for value in values
+        if value is not None and (text := " ".join(str(value).split()))
+    ]
+
 def extract_number(value: Optional[str]) -> Optional[int]:
     if not value:
         return None
-    digits = re.findall(r"\d+", str(value).replace(".", "").replace(" ", ""))
+    digits = _DIGITS_RE.findall(str(value).replace(".", "").replace(" ", ""))
     if not digits:
         return None
     try:
@@ -49,7 +122,7 @@ def parse_price(price_str: Optional[str]) -> Tuple[Optional[int], Optional[str]]
         currency = "CHF"
 
     # Remove non-digit separators except comma/dot used as thousand separator
-    raw_digits = re.sub(r"[^\d]", "", s)
+    raw_digits = _NON_DIGIT_RE.sub("", s)
     if not raw_digits:
         return None, currency
 
@@ -78,8 +151,8 @@ def parse_power(power_str: Optional[str]) -> Tuple[Optional[int], Optional[int]]
     kW = None
     hp = None
 
-    kw_match = re.search(r"(\d+)\s*kW", power_str)
-    hp_match = re.search(r"(\d+)\s*hp", power_str, flags=re.IGNORECASE)
+    kw_match = _KW_RE.search(power_str)
+    hp_match = _HP_RE.search(power_str)
 
     if kw_match:
         try:
@@ -95,99 +168,73 @@ def parse_power(power_str: Optional[str]) -> Tuple[Optional[int], Optional[int]]
 
     return kW, hp
 
-def normalize_listing(listing: Dict[str, Any]) -> Dict[str, Any]:
+def normalize_listing(listing: Listing) -> Listing:
     """
-    Normalize and enrich a raw listing dict with additional derived fields.
+    Clean a parsed Listing in place and fill in its derived fields.
     """
-    listing = dict(listing)
-
-    # Clean basic text fields
-    for key in [
-        "title",
-        "url",
-        "mark",
-        "model",
-        "modelVersion",
-        "location",
-        "dealerName",
-        "dealerRatings",
-        "price",
-        "milage",
-        "gearbox",
-        "firstRegistration",
-        "fuelType",
-        "power",
-        "seller",
-        "contactName",
-        "contactPhone",
-        "bodyType",
-        "drivetrain",
-        "seats",
-        "engineSize",
-        "gears",
-        "emissionClass",
-        "colour",
-        "manufacturerColour",
-        "productionDate",
-    ]:
-        listing[key] = clean_text(listing.get(key))
-
-    # Price breakdown
-    raw_price, currency = parse_price(listing.get("price"))
-    if raw_price is not None:
-        listing["rawPrice"] = raw_price
-    if currency is not None:
-        listing["currency"] = currency
-
-    # Mileage numeric
-    mileage_km = parse_mileage(listing.get("milage"))
-    if mileage_km is not None:
-        listing["mileageKm"] = mileage_km
-
-    # Power breakdown
-    kW, hp = parse_power(listing.get("power"))
-    if kW is not None:
-        listing["powerKW"] = kW
-    if hp is not None:
-        listing["powerHP"] = hp
+    # Clean basic text fields. Spelled out rather than looped over a field
+    # table so each one is a plain attribute access instead of get/setattr.
+    listing.title = clean_text(listing.title)
+    listing.url = clean_text(listing.url)
+    listing.mark = clean_text(listing.mark)
+    listing.model = clean_text(listing.model)
+    listing.modelVersion = clean_text(listing.modelVersion)
+    listing.location = clean_text(listing.location)
+    listing.dealerName = clean_text(listing.dealerName)
+    listing.dealerRatings = clean_text(listing.dealerRatings)
+    listing.price = clean_text(listing.price)
+    listing.milage = clean_text(listing.milage)
+    listing.gearbox = clean_text(listing.gearbox)
+    listing.firstRegistration = clean_text(listing.firstRegistration)
+    listing.fuelType = clean_text(listing.fuelType)
+    listing.power = clean_text(listing.power)
+    listing.seller = clean_text(listing.seller)
+    listing.contactName = clean_text(listing.contactName)
+    listing.contactPhone = clean_text(listing.contactPhone)
+    listing.bodyType = clean_text(listing.bodyType)
+    listing.drivetrain = clean_text(listing.drivetrain)
+    listing.seats = clean_text(listing.seats)
+    listing.engineSize = clean_text(listing.engineSize)
+    listing.gears = clean_text(listing.gears)
+    listing.emissionClass = clean_text(listing.emissionClass)
+    listing.colour = clean_text(listing.colour)
+    listing.manufacturerColour = clean_text(listing.manufacturerColour)
+    listing.productionDate = clean_text(listing.productionDate)
+
+    # Price, mileage and power breakdowns
+    listing.rawPrice, listing.currency = parse_price(listing.price)
+    listing.mileageKm = parse_mileage(listing.milage)
+    listing.powerKW, listing.powerHP = parse_power(listing.power)
 
     # Seats, engine size, gears as numbers when possible
-    for src, dest in [
-        ("seats", "seatsNum"),
-        ("engineSize", "engineSizeCC"),
-        ("gears", "gearsNum"),
-    ]:
-        val = extract_number(listing.get(src))
-        if val is not None:
-            listing[dest] = val
+    listing.seatsNum = extract_number(listing.seats)
+    listing.engineSizeCC = extract_number(listing.engineSize)
+    listing.gearsNum = extract_number(listing.gears)
 
     # Feature lists (comfort/media/safety/extras) as lists of strings
-    for feature_key in ["comfort", "media", "safety", "extras"]:
-        value = listing.get(feature_key)
+    for feature_key in FEATURE_FIELDS:
+        value = getattr(listing, feature_key)
         if isinstance(value, list):
-            listing[feature_key] = [clean_text(v) for v in value if clean_text(v)]
+            setattr(listing, feature_key, [c for v in value if (c := clean_text(v))])
         elif isinstance(value, str):
-            parts = [clean_text(p) for p in re.split(r"[;,]", value) if clean_text(p)]
-            listing[feature_key] = parts
+            parts = [c for p in _FEATURE_SPLIT_RE.split(value) if (c := clean_text(p))]
+            setattr(listing, feature_key, parts)
         elif value is None:
-            listing[feature_key] = []
+            setattr(listing, feature_key, [])
         else:
-            listing[feature_key] = [clean_text(str(value))]
+            setattr(listing, feature_key, [clean_text(str(value))])
 
     # Images as unique non-empty strings
-    images = listing.get("images") or []
+    images = listing.images or []
     if isinstance(images, str):
         images = [images]
-    if isinstance(images, list):
-        seen = set()
-        normalized = []
-        for img in images:
-            img = clean_text(img)
-            if img and img not in seen:
-                seen.add(img)
-                normalized.append(img)
-        listing["images"] = normalized
-    else:
-        listing["images"] = []
+    seen = set()
+    normalized = []
+    for img in images:
+        img = clean_text(img)
+        if img and img not in seen:
+            seen.add(img)
+            normalized.append(img)
+    listing.images = normalized
 
     return listing
\ No newline at end of file
@@ -1,17 +1,196 @@
+import html as html_lib
 import logging
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urljoin, urlsplit
 
-from .data_cleaner import clean_text
+from .data_cleaner import Listing, clean_text, clean_text_many
 
 log = logging.getLogger(__name__)
 
 try:
-    from bs4 import BeautifulSoup
-except ImportError as exc:  # pragma: no cover - environment issue
+    from selectolax.lexbor import LexborCSSSelector, LexborHTMLParser
+except ImportError:  # pragma: no cover - environment issue
+    LexborHTMLParser = None
+
+# lxml.html (with cssselect for CSS support) is only a fallback for
+# platforms without a selectolax wheel.
+try:
+    from lxml import html as lxml_html
+    from lxml.cssselect import CSSSelector
+except ImportError:  # pragma: no cover - optional fallback
+    CSSSelector = None
+
+if LexborHTMLParser is None and CSSSelector is None:  # pragma: no cover
     raise RuntimeError(
-        "BeautifulSoup4 is required. Install with `pip install beautifulsoup4`."
-    ) from exc
+        "selectolax or lxml+cssselect is required. Install with "
+        "`pip install selectolax` or `pip install lxml cssselect`."
+    )
+
+if CSSSelector is not None:
+    _LXML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+# Below this many pages, starting worker processes costs more than it saves.
+PARALLEL_PARSE_MIN_PAGES = 64
+
+# data-testid value -> Listing attribute for the single-value fields.
+TESTID_TO_KEY: Dict[str, str] = {
+    "heading": "title",
+    "price-label": "price",
+    "seller-address": "location",
+    "seller-name": "dealerName",
+    "rating-count": "dealerRatings",
+    "makeLabel": "mark",
+    "modelLabel": "model",
+    "versionLabel": "modelVersion",
+    "mileage-label": "milage",
+    "transmission-label": "gearbox",
+    "first-registration-label": "firstRegistration",
+    "fuel-label": "fuelType",
+    "power-label": "power",
+    "seller-type-label": "seller",
+    "seller-contact-name": "contactName",
+    "seller-phone": "contactPhone",
+    "body-type-label": "bodyType",
+    "drive-type-label": "drivetrain",
+    "num-seats-label": "seats",
+    "cubic-capacity-label": "engineSize",
+    "gears-label": "gears",
+    "emission-class-label": "emissionClass",
+    "exterior-color-label": "colour",
+    "manufacturer-color-label": "manufacturerColour",
+    "production-date-label": "productionDate",
+}
+
+# "heading" is also used on section titles; only the <h1> is the car title.
+TESTID_REQUIRED_TAG: Dict[str, str] = {"heading": "h1"}
+
+# The "...-label"/"...Label" test ids usually mark spans holding a single
+# text node, read directly; labels with child elements get the deep walk.
+LEAF_TESTIDS = frozenset(t for t in TESTID_TO_KEY if t.lower().endswith("label"))
+
+# Class/itemprop selectors from older page layouts, tried in order for
+# fields that no data-testid element provided.
+FALLBACK_SELECTORS: Dict[str, Tuple[str, ...]] = {
+    "title": ("h1", 'h2[data-item-name="car-title"]'),
+    "price": ("div.price-block span", "span[data-item-name=price]"),
+    "location": ("div.seller-address", "span[itemprop=address]"),
+    "dealerName": ("div.dealer-info h2", ".cldt-vendor-contact-box h2"),
+    "dealerRatings": ("span.dealer-rating-count",),
+    "mark": ("span[itemprop=brand]",),
+    "model": ("span[itemprop=model]",),
+    "modelVersion": ("span.model-version",),
+    "milage": (
+        "span.mileage",
+        "dl[data-item-name=vehicle-details] dd:nth-of-type(1)",
+    ),
+    "gearbox": ("span.gearbox",),
+    "firstRegistration": ("span.first-registration",),
+    "fuelType": ("span.fuel",),
+    "power": ("span.power",),
+    "seller": ("span.seller-type",),
+    "contactName": (".cldt-vendor-contact-box span",),
+    "contactPhone": ("a[href^='tel:']",),
+    "bodyType": ("span.body-type",),
+    "drivetrain": ("span.drivetrain",),
+    "seats": ("span.seats",),
+    "engineSize": ("span.engine-size",),
+    "gears": ("span.gears",),
+    "emissionClass": ("span.emission-class",),
+    "colour": ("span.exterior-color",),
+    "manufacturerColour": ("span.manufacturer-color",),
+    "productionDate": ("span.production-date",),
+}
+
+FEATURE_SELECTORS: Dict[str, Tuple[str, ...]] = {
+    "comfort": ('[data-testid="comfort-features"] li', "ul.comfort-features li"),
+    "media": ('[data-testid="media-features"] li', "ul.media-features li"),
+    "safety": ('[data-testid="safety-features"] li', "ul.safety-features li"),
+    "extras": ('[data-testid="other-features"] li', "ul.extra-features li"),
+}
+
+IMAGE_SELECTOR = "figure img, [data-testid='gallery'] img, .image-gallery img"
+
+# Search results: anchors pointing to detail /offers/ or /angebote/ routes.
+LISTING_LINK_SELECTOR = (
+    'a[href*="/angebote/"], a[href*="/offers/"], '
+    'a[data-item-name="detail-page-link"]'
+)
+
+# Best-effort "next page" link, most specific first.
+NEXT_PAGE_SELECTORS: Tuple[str, ...] = (
+    'a[rel="next"]',
+    'a[aria-label*="Next"]',
+    'a[aria-label*="Weiter"]',
+)
+
+# Byte-level equivalents of LISTING_LINK_SELECTOR and of NEXT_PAGE_SELECTORS
+# (in the same order), used before falling back to a DOM. A listing link is
+# an <a> tag whose href has a detail route or that is marked as the
+# detail-page link; its href is then read with _HREF_ATTR_RE. Attribute
+# values may be quoted or, as HTML allows, unquoted.
+_LISTING_LINK_RE = re.compile(
+    rb"""<(?i:a)(?=[^>]*?\s(?:"""
+    rb"""(?i:href)\s*=\s*(?:["'][^"'>]*?|[^"'\s>]*?)/(?:angebote|offers)/"""
+    rb"""|(?i:data-item-name)\s*=\s*["']?detail-page-link(?=["'\s/>])"""
+    rb"""))\s[^>]*>"""
+)
+_NEXT_LINK_RES: Tuple["re.Pattern[bytes]", ...] = (
+    re.compile(rb"""<(?i:a)\s(?:[^>]*?\s)?(?i:rel)\s*=\s*["']?next(?=["'\s/>])[^>]*>"""),
+    re.compile(rb"""<(?i:a)\s(?:[^>]*?\s)?(?i:aria-label)\s*=\s*(?:["'][^"']*|[^"'\s>]*)Next[^>]*>"""),
+    re.compile(rb"""<(?i:a)\s(?:[^>]*?\s)?(?i:aria-label)\s*=\s*(?:["'][^"']*|[^"'\s>]*)Weiter[^>]*>"""),
+)
+# The lookbehinds pick the quoted or unquoted value form in a single group.
+_HREF_ATTR_RE = re.compile(
+    rb"""\s(?i:href)\s*=\s*["']?((?<=["'])[^"'>]*|(?<!["'])[^"'\s>]*)"""
+)
+
+def _decode_href(raw: bytes) -> str:
+    href = raw.decode("utf-8", "replace")
+    # Attribute values may carry entities such as &amp; in query strings.
+    return html_lib.unescape(href) if "&" in href else href
+
+def _main_region(html: bytes) -> bytes:
+    """
+    Return the ``<main>...</main>`` slice of a listing page, or the whole page.
+
+    Autoscout24 renders every extracted field inside <main>; the header,
+    footer and inline scripts around it need not be tokenized. This is tied
+    to that layout, so pages without the markers are parsed in full. The
+    opening tag is looked for after <body>, so a "<main" inside a <head>
+    script cannot start the slice early.
+    """
+    start = html.find(b"<main", max(html.find(b"<body"), 0))
+    end = html.rfind(b"</main>")
+    if 0 <= start < end:
+        return html[start : end + len(b"</main>")]
+    return html
+
+def _resolve_href(href: str, base_url: str, base_origin: str) -> str:
+    """
+    Make ``href`` absolute against ``base_url``.
+
+    Absolute and root-relative links, nearly all links on Autoscout24, are
+    resolved by string checks; only the remaining forms go through urljoin.
+    """
+    if href.startswith(("https://", "http://")):
+        return href
+    if href.startswith("/") and not href.startswith("//"):
+        return base_origin + href
+    return urljoin(base_url, href)
+
+# Selector string -> compiled lxml matcher, filled on first use per process.
+_compiled_selectors: Dict[str, "CSSSelector"] = {}
+
+def _compile_css(selector: str) -> "CSSSelector":
+    compiled = _compiled_selectors.get(selector)
+    if compiled is None:
+        compiled = CSSSelector(selector, translator="html")
+        _compiled_selectors[selector] = compiled
+    return compiled
 
 class ListingParser:
     """
@@ -19,353 +198,246 @@ class ListingParser:
     """
 
     def __init__(self) -> None:
-        self.log = logging.getLogger(self.__class__.__name__)
-
-    def _soup(self, html: str) -> "BeautifulSoup":
-        try:
-            soup = BeautifulSoup(html, "lxml")
-        except Exception:  # noqa: BLE001
-            soup = BeautifulSoup(html, "html.parser")
-        return soup
+        # Lexbor parses and evaluates CSS selectors in C. The lxml fallback
+        # evaluates them as XPath compiled once per selector, also in C.
+        self.use_lexbor = LexborHTMLParser is not None
+        # Each LexborHTMLParser would otherwise build its own CSS parser and
+        # selector engine on its first css()/css_first() call; one is shared
+        # across pages.
+        self._lexbor_selector = LexborCSSSelector() if self.use_lexbor else None
+
+    def _parse_tree(self, html: bytes) -> Any:
+        # Raw response bytes go straight to the C parsers, both reading them
+        # as UTF-8 (what Autoscout24 serves).
+        if self.use_lexbor:
+            return LexborHTMLParser(html)
+        return lxml_html.document_fromstring(html, parser=_LXML_PARSER)
+
+    def _css_first(self, tree: Any, selector: str) -> Any:
+        if self.use_lexbor:
+            matches = self._lexbor_selector.find_first(selector, tree.root)
+        else:
+            matches = _compile_css(selector)(tree)
+        return matches[0] if matches else None
+
+    def _css(self, tree: Any, selector: str) -> List[Any]:
+        if self.use_lexbor:
+            return self._lexbor_selector.find(selector, tree.root)
+        return _compile_css(selector)(tree)
+
+    def _raw_text(self, node: Any) -> str:
+        if self.use_lexbor:
+            return node.text(deep=True, separator=" ", strip=True)
+        return " ".join(node.itertext())
+
+    def _node_text(self, node: Any) -> Optional[str]:
+        return clean_text(self._raw_text(node))
+
+    def _leaf_text(self, node: Any) -> Optional[str]:
+        """
+        Text of a node whose only child is a text node, read without a
+        descendant walk; None for any other node, so callers use _node_text.
+        """
+        if self.use_lexbor:
+            child = node.child
+            if child is None or child.next is not None or child.tag != "-text":
+                return None
+            return clean_text(child.text_content)
+        if len(node):
+            return None
+        return clean_text(node.text)
+
+    def _node_tag(self, node: Any) -> Optional[str]:
+        return node.tag
+
+    def _node_attr(self, node: Any, name: str) -> Optional[str]:
+        if self.use_lexbor:
+            # .attrs reads a single attribute; .attributes would build a
+            # dict of all of them on every call.
+            return node.attrs.get(name)
+        return node.get(name)
+
+    def _scan_search_hrefs(self, html: bytes) -> Tuple[List[str], Optional[str]]:
+        """
+        Pull listing and next-page hrefs out of the raw bytes without a DOM.
+        """
+        hrefs = [
+            _decode_href(href.group(1))
+            for tag in _LISTING_LINK_RE.finditer(html)
+            if (href := _HREF_ATTR_RE.search(tag.group(0)))
+        ]
+        if not hrefs:
+            return [], None
+        for pattern in _NEXT_LINK_RES:
+            tag = pattern.search(html)
+            if tag:
+                href = _HREF_ATTR_RE.search(tag.group(0))
+                return hrefs, _decode_href(href.group(1)) if href else None
+        return hrefs, None
+
+    def _select_search_hrefs(self, html: bytes) -> Tuple[List[str], Optional[str]]:
+        tree = self._parse_tree(html)
+        hrefs = [
+            self._node_attr(a, "href") for a in self._css(tree, LISTING_LINK_SELECTOR)
+        ]
+
+        next_link = None
+        for sel in NEXT_PAGE_SELECTORS:
+            next_link = self._css_first(tree, sel)
+            if next_link is not None:
+                break
+        next_href = (
+            self._node_attr(next_link, "href") if next_link is not None else None
+        )
+        return hrefs, next_href
 
     def parse_search_page(
-        self, html: str, base_url: str
+        self, html: bytes, base_url: str
     ) -> Tuple[List[str], Optional[str]]:
         """
         Extract listing URLs and optional link to next search results page.
+
+        A regex scan of the raw HTML covers the usual markup; the page is
+        only parsed into a tree when that scan finds no listing links.
         """
-        soup = self._soup(html)
+        hrefs, next_href = self._scan_search_hrefs(html)
+        if not hrefs:
+            hrefs, next_href = self._select_search_hrefs(html)
+
+        parts = urlsplit(base_url)
+        base_origin = f"{parts.scheme}://{parts.netloc}"
+        seen: Set[str] = set()
         listing_urls: List[str] = []
 
-        # Common pattern: anchors pointing to detail /offers/ or /angebote/ routes
-        for a in soup.select('a[href*="/angebote/"], a[href*="/offers/"], a[data-item-name="detail-page-link"]'):
-            href = a.get("href")
+        for href in hrefs:
             if not href:
                 continue
-            full_url = urljoin(base_url, href)
-            if full_url not in listing_urls:
+            full_url = _resolve_href(href, base_url, base_origin)
+            if full_url not in seen:
+                seen.add(full_url)
                 listing_urls.append(full_url)
 
-        # Best-effort detection of "next page" link
-        next_link = (
-            soup.select_one('a[rel="next"]')
-            or soup.select_one('a[aria-label*="Next"]')
-            or soup.select_one('a[aria-label*="Weiter"]')
-        )
         next_url = None
-        if next_link and next_link.get("href"):
-            next_url = urljoin(base_url, next_link["href"])
-
-        self.log.debug(
-            "Parsed search page: %d listing URLs, next page: %s",
-            len(listing_urls),
-            "yes" if next_url else "no",
-        )
+        if next_href:
+            next_url = _resolve_href(next_href, base_url, base_origin)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "Parsed search page: %d listing URLs, next page: %s",
+                len(listing_urls),
+                "yes" if next_url else "no",
+            )
         return listing_urls, next_url
 
-    def _select_text(self, soup: "BeautifulSoup", selectors: List[str]) -> Optional[str]:
+    def _select_text(self, tree: Any, selectors: Sequence[str]) -> Optional[str]:
         for sel in selectors:
-            el = soup.select_one(sel)
-            if el:
-                text = clean_text(el.get_text(" ", strip=True))
+            el = self._css_first(tree, sel)
+            if el is not None:
+                text = self._node_text(el)
                 if text:
                     return text
         return None
 
     def _select_all_texts(
-        self, soup: "BeautifulSoup", selectors: List[str]
+        self, tree: Any, selectors: Sequence[str]
     ) -> List[str]:
+        seen: Set[str] = set()
         results: List[str] = []
         for sel in selectors:
-            for el in soup.select(sel):
-                text = clean_text(el.get_text(" ", strip=True))
-                if text and text not in results:
+            raw = [self._raw_text(el) for el in self._css(tree, sel)]
+            for text in clean_text_many(raw):
+                if text not in seen:
+                    seen.add(text)
                     results.append(text)
         return results
 
-    def parse_listing_page(self, html: str, url: str) -> Dict[str, Optional[str]]:
+    def parse_listing_page(self, html: bytes, url: str) -> Listing:
         """
-        Parse a single listing detail page into a dictionary.
+        Parse a single listing detail page into a Listing.
 
-        The keys match the README description for compatibility.
+        Only the scraped fields are set; derived ones are left to
+        normalize_listing.
         """
-        soup = self._soup(html)
-
-        title = self._select_text(
-            soup,
-            [
-                'h1[data-testid="heading"]',
-                "h1",
-                'h2[data-item-name="car-title"]',
-            ],
-        )
-
-        price = self._select_text(
-            soup,
-            [
-                '[data-testid="price-label"]',
-                "div.price-block span",
-                "span[data-item-name=price]",
-            ],
-        )
-
-        location = self._select_text(
-            soup,
-            [
-                '[data-testid="seller-address"]',
-                "div.seller-address",
-                "span[itemprop=address]",
-            ],
-        )
-
-        dealer_name = self._select_text(
-            soup,
-            [
-                '[data-testid="seller-name"]',
-                "div.dealer-info h2",
-                ".cldt-vendor-contact-box h2",
-            ],
-        )
-
-        dealer_ratings = self._select_text(
-            soup,
-            [
-                '[data-testid="rating-count"]',
-                "span.dealer-rating-count",
-            ],
-        )
-
-        mark = self._select_text(
-            soup,
-            [
-                '[data-testid="makeLabel"]',
-                "span[itemprop=brand]",
-            ],
-        )
-
-        model = self._select_text(
-            soup,
-            [
-                '[data-testid="modelLabel"]',
-                "span[itemprop=model]",
-            ],
-        )
-
-        model_version = self._select_text(
-            soup,
-            [
-                '[data-testid="versionLabel"]',
-                "span.model-version",
-            ],
-        )
-
-        milage = self._select_text(
-            soup,
-            [
-                '[data-testid="mileage-label"]',
-                "span.mileage",
-                "dl[data-item-name=vehicle-details] dd:nth-of-type(1)",
-            ],
-        )
-
-        gearbox = self._select_text(
-            soup,
-            [
-                '[data-testid="transmission-label"]',
-                "span.gearbox",
-            ],
-        )
-
-        first_registration = self._select_text(
-            soup,
-            [
-                '[data-testid="first-registration-label"]',
-                "span.first-registration",
-            ],
-        )
-
-        fuel_type = self._select_text(
-            soup,
-            [
-                '[data-testid="fuel-label"]',
-                "span.fuel",
-            ],
-        )
-
-        power = self._select_text(
-            soup,
-            [
-                '[data-testid="power-label"]',
-                "span.power",
-            ],
-        )
-
-        seller = self._select_text(
-            soup,
-            [
-                '[data-testid="seller-type-label"]',
-                "span.seller-type",
-            ],
-        )
-
-        contact_name = self._select_text(
-            soup,
-            [
-                '[data-testid="seller-contact-name"]',
-                ".cldt-vendor-contact-box span",
-            ],
-        )
-
-        contact_phone = self._select_text(
-            soup,
-            [
-                '[data-testid="seller-phone"]',
-                "a[href^='tel:']",
-            ],
-        )
-
-        body_type = self._select_text(
-            soup,
-            [
-                '[data-testid="body-type-label"]',
-                "span.body-type",
-            ],
-        )
-
-        drivetrain = self._select_text(
-            soup,
-            [
-                '[data-testid="drive-type-label"]',
-                "span.drivetrain",
-            ],
-        )
-
-        seats = self._select_text(
-            soup,
-            [
-                '[data-testid="num-seats-label"]',
-                "span.seats",
-            ],
-        )
-
-        engine_size = self._select_text(
-            soup,
-            [
-                '[data-testid="cubic-capacity-label"]',
-                "span.engine-size",
-            ],
-        )
+        tree = self._parse_tree(_main_region(html))
+        listing = Listing(url=clean_text(url))
+
+        # One pass over every data-testid element fills most fields; the
+        # first non-empty match per key wins, as with select_one.
+        for node in self._css(tree, "[data-testid]"):
+            testid = self._node_attr(node, "data-testid")
+            key = TESTID_TO_KEY.get(testid)
+            if key is None or getattr(listing, key) is not None:
+                continue
+            required_tag = TESTID_REQUIRED_TAG.get(testid)
+            if required_tag and self._node_tag(node) != required_tag:
+                continue
+            text = None
+            if testid in LEAF_TESTIDS:
+                text = self._leaf_text(node)
+            if not text:
+                text = self._node_text(node)
+            if text:
+                setattr(listing, key, text)
+
+        # Older page layouts: only query for fields the walk did not find.
+        for key, selectors in FALLBACK_SELECTORS.items():
+            if getattr(listing, key) is None:
+                setattr(listing, key, self._select_text(tree, selectors))
+
+        for key, selectors in FEATURE_SELECTORS.items():
+            setattr(listing, key, self._select_all_texts(tree, selectors))
+
+        seen_images: Set[str] = set()
+        for img in self._css(tree, IMAGE_SELECTOR):
+            src = self._node_attr(img, "src") or self._node_attr(img, "data-src")
+            src = clean_text(src)
+            if src and src not in seen_images:
+                seen_images.add(src)
+                listing.images.append(src)
 
-        gears = self._select_text(
-            soup,
-            [
-                '[data-testid="gears-label"]',
-                "span.gears",
-            ],
-        )
+        return listing
 
-        emission_class = self._select_text(
-            soup,
-            [
-                '[data-testid="emission-class-label"]',
-                "span.emission-class",
-            ],
-        )
+    def _parse_listing_safe(
+        self, html: bytes, url: str
+    ) -> Optional[Listing]:
+        try:
+            return self.parse_listing_page(html, url)
+        except Exception as exc:  # noqa: BLE001
+            log.error("Error parsing %s: %s", url, exc)
+            return None
+
+def create_parse_pool(
+    workers: Optional[int], expected_pages: int
+) -> Optional[ProcessPoolExecutor]:
+    """
+    Process pool for :func:`parse_one`, or None when parsing in-process is cheaper.
 
-        colour = self._select_text(
-            soup,
-            [
-                '[data-testid="exterior-color-label"]',
-                "span.exterior-color",
-            ],
-        )
+    ``workers`` defaults to one per core. Below PARALLEL_PARSE_MIN_PAGES
+    pages, starting the workers costs more than it saves.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or expected_pages < PARALLEL_PARSE_MIN_PAGES:
+        return None
 
-        manufacturer_colour = self._select_text(
-            soup,
-            [
-                '[data-testid="manufacturer-color-label"]',
-                "span.manufacturer-color",
-            ],
-        )
+    # forkserver children start from a clean interpreter, which avoids
+    # forking the parent's event loop and sockets.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("forkserver")
+    else:
+        mp_context = None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=mp_context)
 
-        production_date = self._select_text(
-            soup,
-            [
-                '[data-testid="production-date-label"]',
-                "span.production-date",
-            ],
-        )
+_worker_parser: Optional[ListingParser] = None
 
-        comfort = self._select_all_texts(
-            soup,
-            [
-                '[data-testid="comfort-features"] li',
-                "ul.comfort-features li",
-            ],
-        )
-        media = self._select_all_texts(
-            soup,
-            [
-                '[data-testid="media-features"] li',
-                "ul.media-features li",
-            ],
-        )
-        safety = self._select_all_texts(
-            soup,
-            [
-                '[data-testid="safety-features"] li',
-                "ul.safety-features li",
-            ],
-        )
-        extras = self._select_all_texts(
-            soup,
-            [
-                '[data-testid="other-features"] li',
-                "ul.extra-features li",
-            ],
-        )
+def parse_one(page: Tuple[bytes, str]) -> Optional[Listing]:
+    """
+    Parse one (html, url) listing page; None if it fails to parse.
 
-        image_urls: List[str] = []
-        for img in soup.select(
-            "figure img, [data-testid='gallery'] img, .image-gallery img"
-        ):
-            src = img.get("src") or img.get("data-src")
-            src = clean_text(src)
-            if src and src not in image_urls:
-                image_urls.append(src)
-
-        record: Dict[str, Optional[str] | List[str]] = {
-            "title": title,
-            "url": clean_text(url),
-            "mark": mark,
-            "model": model,
-            "modelVersion": model_version,
-            "location": location,
-            "dealerName": dealer_name,
-            "dealerRatings": dealer_ratings,
-            "price": price,
-            "milage": milage,
-            "gearbox": gearbox,
-            "firstRegistration": first_registration,
-            "fuelType": fuel_type,
-            "power": power,
-            "seller": seller,
-            "contactName": contact_name,
-            "contactPhone": contact_phone,
-            "bodyType": body_type,
-            "drivetrain": drivetrain,
-            "seats": seats,
-            "engineSize": engine_size,
-            "gears": gears,
-            "emissionClass": emission_class,
-            "comfort": comfort,
-            "media": media,
-            "safety": safety,
-            "extras": extras,
-            "colour": colour,
-            "manufacturerColour": manufacturer_colour,
-            "productionDate": production_date,
-            "images": image_urls,
-        }
-
-        return record
\ No newline at end of file
+    Used as the process-pool entry point, and reuses one ListingParser per
+    process.
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ListingParser()
+    html, url = page
+    return _worker_parser._parse_listing_safe(html, url)
\ No newline at end of file
@@ -1,8 +1,7 @@
 import itertools
 import logging
 import os
-import threading
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 log = logging.getLogger(__name__)
 
@@ -21,17 +20,20 @@ class ProxyManager:
     ) -> None:
         env_proxies: List[str] = []
         if use_env:
-            for env_key in ("HTTP_PROXIES", "HTTPS_PROXIES"):
-                raw = os.getenv(env_key)
-                if raw:
-                    env_proxies.extend(
-                        p.strip() for p in raw.split(",") if p.strip()
-                    )
+            env_raw = ",".join(
+                os.getenv(env_key) or "" for env_key in ("HTTP_PROXIES", "HTTPS_PROXIES")
+            )
+            env_proxies = [p for raw in env_raw.split(",") if (p := raw.strip())]
 
         all_proxies = list(proxies or []) + env_proxies
-        self._proxies = [p for p in all_proxies if p]
-        self._lock = threading.Lock()
-        self._iterator = itertools.cycle(self._proxies) if self._proxies else None
+        self._proxies: Tuple[str, ...] = tuple(p for p in all_proxies if p)
+        # One shared mapping per proxy, handed out by get_next.
+        self._proxy_dicts = tuple({"http": p, "https": p} for p in self._proxies)
+        # next() on itertools.count is atomic under the GIL, so rotation
+        # needs no lock.
+        self._counter = itertools.count()
+        # Indices of proxies reported unusable via mark_dead.
+        self._dead: Set[int] = set()
 
         if self._proxies:
             log.info("ProxyManager configured with %d proxies.", len(self._proxies))
@@ -41,17 +43,39 @@ class ProxyManager:
     def has_proxies(self) -> bool:
         return bool(self._proxies)
 
+    def mark_dead(self, proxy: str) -> None:
+        """
+        Skip ``proxy`` in future rotations.
+        """
+        try:
+            idx = self._proxies.index(proxy)
+        except ValueError:
+            return
+        if idx not in self._dead:
+            self._dead.add(idx)
+            log.warning(
+                "Proxy %s marked dead; %d of %d left.",
+                proxy,
+                len(self._proxies) - len(self._dead),
+                len(self._proxies),
+            )
+
     def get_next(self) -> Optional[Dict[str, str]]:
         """
-        Return a proxies dict suitable for requests, or None when no proxy is configured.
+        Return the next proxy as {"http": url, "https": url}, or None when no
+        proxy is configured. The fetcher passes the "http" entry to aiohttp.
+
+        The dict is shared between calls and must be treated as read-only.
         """
-        if not self._iterator:
-            return None
-        with self._lock:
-            proxy = next(self._iterator, None)
-        if not proxy:
+        n = len(self._proxy_dicts)
+        if not n:
             return None
-        return {
-            "http": proxy,
-            "https": proxy,
-        }
\ No newline at end of file
+        idx = next(self._counter) % n
+        if self._dead:
+            # Probe at most n slots; if every proxy is dead keep rotating
+            # through them rather than silently switching to direct mode.
+            for _ in range(n):
+                if idx not in self._dead:
+                    break
+                idx = next(self._counter) % n
+        return self._proxy_dicts[idx]
\ No newline at end of file
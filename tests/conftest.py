@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scraper is run from src/ and imports its packages top-level.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
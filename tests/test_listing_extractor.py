@@ -0,0 +1,172 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+from extractors import listing_extractor
+from extractors.listing_extractor import ListingExtractor
+from utils.proxy_manager import ProxyManager
+
+SEARCH_URL = "https://www.autoscout24.com/lst/audi?sort=age&page=1"
+
+def make_extractor(**kwargs):
+    return ListingExtractor(proxy_manager=ProxyManager(use_env=False), **kwargs)
+
+def page_url(k):
+    return f"https://www.autoscout24.com/lst/audi?sort=age&page={k}"
+
+def search_pages(n_pages, per_page=20):
+    """page URL -> (listing URLs, next page URL), as from _fetch_search_page."""
+    return {
+        page_url(k): (
+            [
+                f"https://www.autoscout24.com/offers/car-{k}-{i}"
+                for i in range(per_page)
+            ],
+            page_url(k + 1) if k < n_pages else None,
+        )
+        for k in range(1, n_pages + 1)
+    }
+
+def collect(extractor, budget, pages, delays=None, failures=()):
+    """
+    Run _collect_listing_urls_from_search against canned pages; returns the
+    yielded URLs, the requested pages and the pages whose fetch was cancelled.
+    """
+    requested, cancelled = [], []
+    failures = list(failures)
+
+    async def fetch_search_page(url):
+        requested.append(url)
+        try:
+            await asyncio.sleep((delays or {}).get(url, 0))
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        if url in failures:
+            failures.remove(url)
+            return None
+        return pages.get(url, ([], None))
+
+    extractor._fetch_search_page = fetch_search_page
+
+    async def run():
+        found = extractor._collect_listing_urls_from_search(SEARCH_URL, budget)
+        return [u async for u in found]
+
+    return asyncio.run(run()), requested, cancelled
+
+def test_generate_page_urls_continues_from_start_page():
+    extractor = make_extractor()
+    start_url = "https://www.autoscout24.com/lst/audi?sort=age&page=3&atype=C"
+    urls = list(extractor._generate_page_urls(start_url, 3))
+    assert urls == [
+        start_url,
+        "https://www.autoscout24.com/lst/audi?sort=age&page=4&atype=C",
+        "https://www.autoscout24.com/lst/audi?sort=age&page=5&atype=C",
+    ]
+
+@pytest.mark.parametrize(
+    "start_url",
+    [
+        "https://www.autoscout24.com/lst/audi",
+        "https://www.autoscout24.com/lst/audi?page=x",
+    ],
+)
+def test_generate_page_urls_defaults_to_first_page(start_url):
+    extractor = make_extractor()
+    urls = list(extractor._generate_page_urls(start_url, 2))
+    assert urls == [start_url, "https://www.autoscout24.com/lst/audi?page=2"]
+
+def test_generate_page_urls_single_page():
+    extractor = make_extractor()
+    assert list(extractor._generate_page_urls(SEARCH_URL, 1)) == [SEARCH_URL]
+
+def test_search_keeps_page_order():
+    pages = search_pages(3)
+    # Later pages finish first; results must still come back in page order.
+    delays = {page_url(1): 0.03, page_url(2): 0.02, page_url(3): 0.01}
+    urls, requested, _ = collect(make_extractor(), 50, pages, delays)
+
+    assert urls == [u for k in (1, 2, 3) for u in pages[page_url(k)][0]]
+    assert requested == [page_url(1), page_url(2), page_url(3)]
+
+def test_search_cancels_unread_pages_once_budget_is_met():
+    pages = search_pages(2, per_page=40)
+    urls, _, cancelled = collect(make_extractor(), 40, pages, {page_url(2): 1.0})
+
+    assert len(urls) == 40
+    assert cancelled == [page_url(2)]
+
+def test_search_continues_sequentially_past_predicted_pages():
+    # Only 10 listings per page, so the two predicted pages fall short.
+    urls, requested, _ = collect(make_extractor(), 40, search_pages(4, per_page=10))
+
+    assert len(urls) == 40
+    assert requested == [page_url(k) for k in range(1, 5)]
+
+def test_search_resumes_from_last_next_link_after_failed_page():
+    urls, requested, _ = collect(
+        make_extractor(), 60, search_pages(4), failures=[page_url(3)]
+    )
+
+    assert len(urls) == 60
+    # Page 3 failed up front and is requested again via page 2's next link.
+    assert requested == [page_url(1), page_url(2), page_url(3), page_url(3)]
+
+class FakeResponse:
+    def __init__(self, url, status):
+        self.url = url
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                SimpleNamespace(real_url=self.url), (), status=self.status
+            )
+
+    async def read(self):
+        return b"<html></html>"
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = 0
+
+    def get(self, url, proxy=None):
+        self.requests += 1
+        return FakeResponse(url, self.statuses.pop(0))
+
+def fetch(extractor, session):
+    async def run():
+        extractor._semaphore = asyncio.Semaphore(1)
+        extractor._session = session
+        return await extractor._fetch_url("https://www.autoscout24.com/offers/x")
+
+    return asyncio.run(run())
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(listing_extractor, "RETRY_BACKOFF_SECONDS", 0)
+
+def test_fetch_retries_transient_statuses(no_backoff):
+    session = FakeSession([503, 429, 200])
+    assert fetch(make_extractor(), session) == b"<html></html>"
+    assert session.requests == 3
+
+def test_fetch_gives_up_after_max_retries(no_backoff):
+    session = FakeSession([502] * (listing_extractor.MAX_RETRIES + 1))
+    assert fetch(make_extractor(), session) is None
+    assert session.requests == listing_extractor.MAX_RETRIES + 1
+
+def test_fetch_does_not_retry_client_errors(no_backoff):
+    session = FakeSession([404])
+    assert fetch(make_extractor(), session) is None
+    assert session.requests == 1
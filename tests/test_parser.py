@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import pytest
+
+from utils import parser as parser_module
+from utils.data_cleaner import normalize_listing
+from utils.parser import ListingParser, _main_region
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+SEARCH_URL = "https://www.autoscout24.com/lst/audi?page=1"
+LISTING_URL = "https://www.autoscout24.com/offers/audi-a6-diesel-grey-1"
+
+BACKENDS = ["lexbor", "lxml"]
+
+@pytest.fixture(params=BACKENDS)
+def listing_parser(request):
+    parser = ListingParser()
+    if request.param == "lexbor":
+        if not parser.use_lexbor:
+            pytest.skip("selectolax is not installed")
+    else:
+        if parser_module.CSSSelector is None:
+            pytest.skip("lxml/cssselect is not installed")
+        parser.use_lexbor = False
+    return parser
+
+def read_fixture(name):
+    return (FIXTURES / name).read_bytes()
+
+def test_main_region_slices_between_markers():
+    html = (
+        b"<html><body><header>h</header><main><p>x</p></main>"
+        b"<footer>f</footer></body></html>"
+    )
+    assert _main_region(html) == b"<main><p>x</p></main>"
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        b"<html><body><p>no main element</p></body></html>",
+        b"<html><body><main><p>unterminated</p></body></html>",
+        b"<html><body><p>stray</p></main></body></html>",
+    ],
+)
+def test_main_region_without_both_markers_returns_page(html):
+    assert _main_region(html) == html
+
+def test_main_region_ignores_main_inside_head_script():
+    html = (
+        b"<html><head><script>var t = '<main>';</script></head>"
+        b"<body><header><h1>site</h1></header><main><h1>car</h1></main></body></html>"
+    )
+    assert _main_region(html) == b"<main><h1>car</h1></main>"
+
+def test_main_region_with_main_only_inside_script_returns_page():
+    html = (
+        b"<html><head><script>var t = '<main></main>';</script></head>"
+        b"<body><p>x</p></body></html>"
+    )
+    assert _main_region(html) == html
+
+def test_parse_search_page_scan_matches_dom_fallback(listing_parser):
+    html = read_fixture("search_page.html")
+
+    scanned = listing_parser._scan_search_hrefs(html)
+    selected = listing_parser._select_search_hrefs(html)
+    assert scanned == selected
+
+    urls, next_url = listing_parser.parse_search_page(html, SEARCH_URL)
+    assert urls == [
+        "https://www.autoscout24.com/offers/audi-a6-diesel-grey-1",
+        "https://www.autoscout24.com/offers/bmw-320-petrol-black-2",
+        "https://www.autoscout24.com/angebote/vw-golf-benzin-rot-3?src=list&pos=3",
+        "https://www.autoscout24.com/details/opel-astra-4",
+        "https://www.autoscout24.com/offers/seat-leon-diesel-white-5",
+        "https://www.autoscout24.com/details/skoda-octavia-6",
+    ]
+    assert next_url == "https://www.autoscout24.com/lst?page=2&sort=age"
+
+@pytest.mark.parametrize(
+    "next_link",
+    [
+        b'<a rel="next" href="/lst?page=2">Next</a>',
+        b"<a rel=next href=/lst?page=2>Next</a>",
+        b"<a aria-label='Next page' href='/lst?page=2'>&gt;</a>",
+        b"<a aria-label=Weiter href=/lst?page=2>&gt;</a>",
+    ],
+)
+def test_scan_next_link_matches_dom_fallback(listing_parser, next_link):
+    html = b"<body><a href=/offers/audi-a6-1>Audi</a>" + next_link + b"</body>"
+
+    scanned = listing_parser._scan_search_hrefs(html)
+    assert scanned == listing_parser._select_search_hrefs(html)
+    assert scanned == (["/offers/audi-a6-1"], "/lst?page=2")
+def test_parse_listing_page_fixture(listing_parser):
+    listing = listing_parser.parse_listing_page(
+        read_fixture("listing_page.html"), LISTING_URL
+    )
+
+    assert listing.url == LISTING_URL
+    # The header <h1> and footer label lie outside <main> and are skipped.
+    assert listing.title == "Audi A6 3,0 TDI"
+    assert listing.milage == "161,415 km"
+    assert listing.price == "€ 31,980"
+    # Labels with child elements keep the nested text.
+    assert listing.power == "240 kW (326 hp)"
+    assert listing.dealerName == "KFZ Hödl GmbH"
+    assert listing.comfort == ["Air conditioning", "Cruise control"]
+    assert listing.images == ["https://img/1.jpg", "https://img/2.jpg"]
+
+    normalize_listing(listing)
+    assert listing.powerKW == 240
+    assert listing.powerHP == 326
@@ -0,0 +1,38 @@
+from utils.proxy_manager import ProxyManager
+
+PROXIES = ["http://p1:8080", "http://p2:8080", "http://p3:8080"]
+
+def rotation(manager, n):
+    return [manager.get_next()["http"] for _ in range(n)]
+
+def test_get_next_without_proxies_returns_none():
+    manager = ProxyManager(use_env=False)
+    assert not manager.has_proxies()
+    assert manager.get_next() is None
+
+def test_get_next_rotates_round_robin():
+    manager = ProxyManager(PROXIES, use_env=False)
+    assert manager.get_next() == {"http": PROXIES[0], "https": PROXIES[0]}
+    assert rotation(manager, 4) == PROXIES[1:] + PROXIES[:2]
+
+def test_env_proxies_follow_explicit_ones(monkeypatch):
+    monkeypatch.setenv("HTTP_PROXIES", " http://e1:1 ,,http://e2:2")
+    monkeypatch.delenv("HTTPS_PROXIES", raising=False)
+    manager = ProxyManager(["http://p1:8080"])
+    assert rotation(manager, 3) == ["http://p1:8080", "http://e1:1", "http://e2:2"]
+
+def test_mark_dead_skips_proxy():
+    manager = ProxyManager(PROXIES, use_env=False)
+    manager.mark_dead(PROXIES[1])
+    assert rotation(manager, 4) == [PROXIES[0], PROXIES[2], PROXIES[0], PROXIES[2]]
+
+def test_mark_dead_ignores_unknown_proxy():
+    manager = ProxyManager(PROXIES, use_env=False)
+    manager.mark_dead("http://unknown:1")
+    assert rotation(manager, 3) == PROXIES
+
+def test_all_dead_keeps_rotating():
+    manager = ProxyManager(PROXIES, use_env=False)
+    for proxy in PROXIES:
+        manager.mark_dead(proxy)
+    assert set(rotation(manager, 6)) == set(PROXIES)